@@ -1,81 +1,130 @@
+import functools
 import html as _html
 import re
 from datetime import datetime
 from typing import Any
 
+from lxml import etree as _lxml_etree
+from lxml import html as _lxml_html
+
+_XML_DECL_RE = re.compile(r"\A\ufeff?\s*<\?xml\b[^>]*\?>")
+_WS_RE = re.compile(r"\s+")
+_KW_RE = re.compile(
+    r"Arriv(?:ed|e|ing)|Depart(?:ed|ure)?|On Time|Yet to start|Reached Destination"
+    r"|Current Position|Last Updates On|Start Date",
+    re.I,
+)
+_LAST_UPDATES_FIX_RE = re.compile(r"Last Updates On(?=\d)")
+_LAST_UPD_RE = re.compile(
+    r"Last Updates On\s*(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})(?:\s+(?P<time>\d{1,2}:\d{2}))?",
+    re.I,
+)
+_START_DATE_RE = re.compile(
+    r"Start Date\s*:\s*(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})", re.I
+)
+_FULL_DATE_RE = re.compile(r"\d{1,2}-[A-Za-z]{3}-\d{4}$")
+# _EVENT_RE needs "Arrived"/"Departed", so lines without either can be skipped;
+# most event lines start with the verb, which a set lookup settles first.
+_EVENT_VERBS = frozenset({"arrived", "departed"})
+_EVENT_VERB_RE = re.compile(r"arrived|departed", re.I)
+_DELAY_RE = re.compile(r"Delay[:\-\s]*\(?\s*(?:Delay\s*)?([0-9:]{1,5})\)?", re.I)
+# Used with .match(): each branch scans the whole line, so a "<verb> from|at
+# <station> (<code>)" anywhere beats "<verb> from|at <station> at|on", which
+# beats a bare verb.
+_EVENT_RE = re.compile(
+    r".*?\b(?P<paren_type>Departed|Arrived)\b\s+(?:from|at)\s+"
+    r"(?P<paren_station>[^()]+?)\s*\(\s*(?P<code>[A-Z0-9]{1,6})\s*\)"
+    r"|.*?\b(?P<at_on_type>Departed|Arrived)\b\s+(?:from|at)\s+"
+    r"(?P<station>.+?)\s+(?:at|on)\b"
+    r"|.*?\b(?P<type>Departed|Arrived)\b",
+    re.I,
+)
+_TRAILING_AT_ON_RE = re.compile(r"\b(on|at)\b$", re.I)
+_DT_RE = re.compile(r"(?P<date>\d{1,2}-[A-Za-z]{3}(?:-\d{4})?)|(?P<time>\d{1,2}:\d{2})")
+
+_MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
 
 def today_str() -> str:
     """Return today's date in the format expected by the upstream site."""
     return datetime.now().strftime("%d-%b-%Y")
 
 
-def _strip_html(html_text: str) -> str:
-    html_text = re.sub(r"(?is)<script.*?>.*?</script>", "", html_text)
-    html_text = re.sub(r"(?is)<style.*?>.*?</style>", "", html_text)
-    return re.sub(r"<[^>]+>", "", html_text)
-
-
-def extract_status_lines(html_text: str) -> list[str]:
-    """Extract human-readable status lines from the upstream HTML response."""
-    text = _strip_html(html_text)
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-
-    keywords = [
-        "Arrived",
-        "Arrive",
-        "Arriving",
-        "Departed",
-        "Depart",
-        "Departure",
-        "On Time",
-        "Yet to start",
-        "Reached Destination",
-        "Current Position",
-        "Last Updates On",
-        "Start Date",
-    ]
-
-    matches: list[str] = []
-    for ln in lines:
-        lnl = ln.lower()
-        for kw in keywords:
-            if kw.lower() in lnl:
-                matches.append(ln)
-                break
-
-    seen: set[str] = set()
-    uniq: list[str] = []
-    for m in matches:
-        if m not in seen:
-            uniq.append(m)
-            seen.add(m)
-
-    return uniq
+def _html_to_text(html_text: str) -> str:
+    if "<" not in html_text:
+        # Plain-text/error bodies: nothing to parse, only entities to decode.
+        return _html.unescape(html_text)
+    # lxml rejects str input that carries an encoding declaration (XHTML pages);
+    # the text is already decoded, so the declaration can simply be dropped.
+    html_text = _XML_DECL_RE.sub("", html_text, count=1)
+    try:
+        tree = _lxml_html.fromstring(html_text)
+    except _lxml_etree.ParserError:
+        # Raised for documents with no elements or text at all.
+        return ""
+    for el in list(tree.iter("script", "style")):
+        el.drop_tree()
+    return tree.text_content()
 
 
 def _clean_line(line: str) -> str:
-    line = _html.unescape(line)
-    line = line.replace("\xa0", " ")
-    line = re.sub(r"\s+", " ", line)
-    line = re.sub(r"Last Updates On(?=\d)", "Last Updates On ", line)
+    # Entities are already decoded by lxml; \s also matches NBSP. Every
+    # whitespace character other than " " is non-printable, so a printable line
+    # without a double space has nothing to collapse.
+    if "  " in line or not line.isprintable():
+        line = _WS_RE.sub(" ", line)
+    if "Last Updates On" in line:
+        line = _LAST_UPDATES_FIX_RE.sub("Last Updates On ", line)
     return line.strip(" \t\n\r\u00a0")
 
 
+def extract_status_lines(html_text: str) -> list[str]:
+    """Extract cleaned, de-duplicated status lines from the upstream HTML response."""
+    matches = (
+        ln
+        for raw in _html_to_text(html_text).splitlines()
+        if (ln := _clean_line(raw)) and _KW_RE.search(ln)
+    )
+    return list(dict.fromkeys(matches))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_dt(s: str) -> datetime:
+    # The same "dd-Mon-yyyy HH:MM" strings recur across lines of one response.
+    # The format is fixed, so split it by hand instead of going through strptime.
+    date_s, _, time_s = s.partition(" ")
+    day, mon, year = date_s.split("-")
+    hour, minute = time_s.split(":")
+    month = _MONTHS.get(mon.title())
+    if month is None:
+        raise ValueError(f"Unknown month abbreviation: {mon!r}")
+    return datetime(int(year), month, int(day), int(hour), int(minute))
+
+
 def _parse_last_update_dt(lines: list[str]) -> datetime | None:
     last_updates: list[datetime] = []
     for ln in lines:
-        m = re.search(
-            r"Last Updates On\s*(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})(?:\s+(?P<time>\d{1,2}:\d{2}))?",
-            ln,
-            flags=re.I,
-        )
+        m = _LAST_UPD_RE.search(ln)
         if not m:
             continue
 
         date = m.group("date")
         time = m.group("time") or "00:00"
         try:
-            last_updates.append(datetime.strptime(f"{date} {time}", "%d-%b-%Y %H:%M"))
+            last_updates.append(_parse_dt(f"{date} {time}"))
         except Exception:  # pylint: disable=broad-except
             continue
 
@@ -84,11 +133,7 @@ def _parse_last_update_dt(lines: list[str]) -> datetime | None:
 
 def _parse_start_date(lines: list[str]) -> str | None:
     for ln in lines:
-        m = re.search(
-            r"Start Date\s*:\s*(?P<date>\d{1,2}-[A-Za-z]{3}-\d{4})",
-            ln,
-            flags=re.I,
-        )
+        m = _START_DATE_RE.search(ln)
         if m:
             return m.group("date")
     return None
@@ -104,21 +149,19 @@ def _build_event_dt(
 
     if date_part:
         # date_part may be '30-Dec' or '30-Dec-2025'
-        if re.match(r"\d{1,2}-[A-Za-z]{3}-\d{4}$", date_part):
+        if _FULL_DATE_RE.match(date_part):
             ds = date_part
         else:
             yr = last_update_dt.year if last_update_dt else datetime.now().year
             ds = f"{date_part}-{yr}"
         try:
-            return datetime.strptime(f"{ds} {time_part}", "%d-%b-%Y %H:%M")
+            return _parse_dt(f"{ds} {time_part}")
         except Exception:  # pylint: disable=broad-except
             return None
 
     if last_update_dt:
         try:
-            return datetime.strptime(
-                f"{last_update_dt.strftime('%d-%b-%Y')} {time_part}", "%d-%b-%Y %H:%M"
-            )
+            return _parse_dt(f"{last_update_dt.strftime('%d-%b-%Y')} {time_part}")
         except Exception:  # pylint: disable=broad-except
             return None
 
@@ -130,106 +173,73 @@ def parse_train_status_html(html_text: str) -> dict[str, Any]:
 
     Returns a dict with keys: start_date (str|None), last_update (datetime|None), events (list[dict]).
     """
-    raw_lines = extract_status_lines(html_text)
-    lines = [_clean_line(r) for r in raw_lines]
+    lines = extract_status_lines(html_text)
 
     last_update_dt = _parse_last_update_dt(lines)
     start_date = _parse_start_date(lines)
 
     events: list[dict[str, Any]] = []
     for ln in lines:
-        if not re.search(
-            r"\b(arrived|arrive|arriving|departed|depart|departure)\b", ln, flags=re.I
-        ):
+        first_word = ln.partition(" ")[0].lower()
+        if first_word not in _EVENT_VERBS and not _EVENT_VERB_RE.search(ln):
             continue
 
-        ev: dict[str, Any] = {
-            "raw": ln,
-            "type": None,
-            "station": None,
-            "code": None,
-            "datetime": None,
-            "delay": None,
-        }
-
-        dm = re.search(
-            r"Delay[:\-\s]*\(?\s*(?:Delay\s*)?([0-9:]{1,5})\)?", ln, flags=re.I
-        )
-        if dm:
-            ev["delay"] = dm.group(1)
+        m = _EVENT_RE.match(ln)
+        if not m:
+            continue
 
-        m = re.search(
-            r"\b(Departed|Arrived)\b\s+(?:from|at)\s+(?P<station>[^()]+?)\s*\(\s*(?P<code>[A-Z0-9]{1,6})\s*\)",
-            ln,
-            flags=re.I,
+        if m.group("paren_type") is not None:
+            ev_type = m.group("paren_type")
+            station = m.group("paren_station").strip()
+            code = m.group("code").strip()
+        elif m.group("at_on_type") is not None:
+            ev_type = m.group("at_on_type")
+            station = _TRAILING_AT_ON_RE.sub("", m.group("station").strip()).strip()
+            code = None
+        else:
+            ev_type = m.group("type")
+            station = None
+            code = None
+
+        date_part: str | None = None
+        time_part: str | None = None
+        for dtm in _DT_RE.finditer(ln):
+            if dtm.lastgroup == "date":
+                date_part = date_part or dtm.group("date")
+            else:
+                time_part = time_part or dtm.group("time")
+            if date_part and time_part:
+                break
+
+        ev_dt = _build_event_dt(
+            date_part=date_part,
+            time_part=time_part,
+            last_update_dt=last_update_dt,
         )
-        if m:
-            ev["type"] = m.group(1).title()
-            ev["station"] = m.group("station").strip()
-            ev["code"] = m.group("code").strip()
-
-            mtime = re.search(r"(\d{1,2}:\d{2})", ln)
-            mdate = re.search(r"(\d{1,2}-[A-Za-z]{3}(?:-\d{4})?)", ln)
-            ev_dt = _build_event_dt(
-                date_part=mdate.group(1) if mdate else None,
-                time_part=mtime.group(1) if mtime else None,
-                last_update_dt=last_update_dt,
-            )
-            ev["datetime"] = ev_dt
-
-            if ev["type"] and ev["station"]:
-                events.append(ev)
+        dm = _DELAY_RE.search(ln)
+
+        # Lines naming a station are kept on that alone; bare verbs need a timestamp.
+        if not (station if station is not None else ev_dt):
             continue
 
-        m2 = re.search(
-            r"\b(Departed|Arrived)\b\s+(?:from|at)\s+(?P<station>.+?)\s+(?:at|on)\b",
-            ln,
-            flags=re.I,
+        events.append(
+            {
+                "raw": ln,
+                "type": ev_type.title(),
+                "station": station,
+                "code": code,
+                "datetime": ev_dt,
+                "delay": dm.group(1) if dm else None,
+            }
         )
-        if m2:
-            ev["type"] = m2.group(1).title()
-            station = m2.group("station").strip()
-            station = re.sub(r"\b(on|at)\b$", "", station, flags=re.I).strip()
-            ev["station"] = station
-
-            mtime = re.search(r"(\d{1,2}:\d{2})", ln)
-            mdate = re.search(r"(\d{1,2}-[A-Za-z]{3}(?:-\d{4})?)", ln)
-            ev_dt = _build_event_dt(
-                date_part=mdate.group(1) if mdate else None,
-                time_part=mtime.group(1) if mtime else None,
-                last_update_dt=last_update_dt,
-            )
-            ev["datetime"] = ev_dt
-
-            if ev["type"] and ev["station"]:
-                events.append(ev)
-            continue
 
-        mverb = re.search(r"\b(Departed|Arrived)\b", ln, flags=re.I)
-        if mverb:
-            ev["type"] = mverb.group(1).title()
-            mtime = re.search(r"(\d{1,2}:\d{2})", ln)
-            mdate = re.search(r"(\d{1,2}-[A-Za-z]{3}(?:-\d{4})?)", ln)
-            ev_dt = _build_event_dt(
-                date_part=mdate.group(1) if mdate else None,
-                time_part=mtime.group(1) if mtime else None,
-                last_update_dt=last_update_dt,
-            )
-            ev["datetime"] = ev_dt
-            if ev["datetime"] and ev["type"]:
-                events.append(ev)
-
-    seen: set[tuple[Any, Any, Any]] = set()
-    uniq_events: list[dict[str, Any]] = []
+    # First occurrence wins for each (type, station, datetime).
+    uniq: dict[tuple[Any, Any, Any], dict[str, Any]] = {}
     for e in events:
-        key = (e.get("type"), e.get("station"), e.get("datetime"))
-        if key in seen:
-            continue
-        seen.add(key)
-        uniq_events.append(e)
+        uniq.setdefault((e["type"], e["station"], e["datetime"]), e)
 
     return {
         "start_date": start_date,
         "last_update": last_update_dt,
-        "events": uniq_events,
+        "events": list(uniq.values()),
     }
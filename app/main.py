@@ -1,13 +1,28 @@
-from fastapi import FastAPI, Query
-from starlette.concurrency import run_in_threadpool
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from fastapi import FastAPI, Path, Query
 
 from app.schemas.train_schema import TrainStatusResponse
 from app.services.train_service import get_train_status
+from app.utils.train_util import close_upstream_client, open_upstream_client
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    open_upstream_client()
+    try:
+        yield
+    finally:
+        await close_upstream_client()
+
 
 app = FastAPI(
     title="Train Track API",
     version="0.1.0",
     description="FastAPI service for fetching and parsing Indian Railways train running status.",
+    lifespan=lifespan,
 )
 
 
@@ -18,7 +33,14 @@ async def read_root():
 
 @app.get("/train/{train_number}", response_model=TrainStatusResponse)
 async def get_train(
-    train_number: int,
+    train_number: Annotated[
+        int,
+        Path(
+            ge=10000,
+            le=99999,
+            description="5-digit Indian Railways train number (10000-99999).",
+        ),
+    ],
     start_time: str | None = Query(
         default=None,
         description=(
@@ -35,4 +57,4 @@ async def get_train(
     ),
 ) -> TrainStatusResponse:
     """Get train running status for the given train number."""
-    return await run_in_threadpool(get_train_status, train_number, start_time, end_time)
+    return await get_train_status(train_number, start_time, end_time)
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime, time, timedelta
 
-import requests
+import httpx
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 
 from app.helpers.train_helper import parse_train_status_html
 from app.schemas.train_schema import TrainEvent, TrainStatusResponse
 from app.utils.train_util import UpstreamError, fetch_train_status_html
 
+_EVENTS_ADAPTER = TypeAdapter(list[TrainEvent])
+
 
 def _compute_event_window(
     *,
@@ -18,14 +21,11 @@ def _compute_event_window(
     now = datetime.now()
     today = now.date()
 
-    local_tz = datetime.now().astimezone().tzinfo
-
     def _normalize_dt(dt: datetime) -> datetime:
         if dt.tzinfo is None:
             return dt
-        if local_tz is None:
-            return dt.replace(tzinfo=None)
-        return dt.astimezone(local_tz).replace(tzinfo=None)
+        # astimezone() with no argument applies the local offset in effect at dt.
+        return dt.astimezone().replace(tzinfo=None)
 
     def _parse_bound(raw: str) -> tuple[datetime | None, time | None]:
         s = raw.strip()
@@ -105,49 +105,40 @@ def _compute_event_window(
     return start_dt, end_dt
 
 
-def _validate_train_number(train_number: int) -> None:
-
-    # Indian Railways train numbers are typically 5 digits.
-    if train_number < 10000 or train_number > 99999:
-        raise HTTPException(
-            status_code=422,
-            detail="train_number must be a 5-digit number (10000-99999)",
-        )
-
-
-def get_train_status(
+async def get_train_status(
     train_number: int,
     start_time: str | None = None,
     end_time: str | None = None,
 ) -> TrainStatusResponse:
     """Orchestrate fetching + parsing into a Swagger-friendly response model."""
-    _validate_train_number(train_number)
-
     try:
-        html_text = fetch_train_status_html(train_number)
+        html_text = await fetch_train_status_html(train_number)
     except UpstreamError as e:
         raise HTTPException(status_code=502, detail=str(e)) from e
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=502,
             detail="Upstream request failed while fetching train status",
         ) from e
 
     parsed = parse_train_status_html(html_text)
-    events = [TrainEvent(**e) for e in parsed.get("events", [])]
 
     window_start, window_end = _compute_event_window(
         start_time_raw=start_time,
         end_time_raw=end_time,
     )
 
-    events = [
+    # Filter the raw dicts first so only events inside the window are validated.
+    kept = [
         e
-        for e in events
-        if e.datetime is not None and window_start <= e.datetime < window_end
+        for e in parsed.get("events", [])
+        if (dt := e.get("datetime")) is not None and window_start <= dt < window_end
     ]
+    events = _EVENTS_ADAPTER.validate_python(kept)
 
-    return TrainStatusResponse(
+    # Every field is already validated (events above, the rest by the parser
+    # and path validation), so skip re-validating the envelope.
+    return TrainStatusResponse.model_construct(
         train_number=train_number,
         start_date=parsed.get("start_date"),
         last_update=parsed.get("last_update"),
@@ -1,7 +1,9 @@
+import asyncio
 import re
+import time
 from datetime import datetime
 
-import requests
+import httpx
 
 from app.helpers.train_helper import today_str
 
@@ -24,19 +26,24 @@ DEFAULT_HEADERS = {
     "X-Requested-With": "XMLHttpRequest",
 }
 
+# How long a CSRF token is reused before bootstrapping a fresh one.
+CSRF_TOKEN_TTL_S = 300.0
+
 
 class UpstreamError(RuntimeError):
     """Raised when the upstream service fails or returns unexpected data."""
 
 
-def _bootstrap_session(session: requests.Session, *, timeout_s: float) -> None:
-    r = session.get(f"{BASE_URL}/", timeout=timeout_s)
+async def _bootstrap_session(client: httpx.AsyncClient, *, timeout_s: float) -> None:
+    r = await client.get(f"{BASE_URL}/", timeout=timeout_s)
     r.raise_for_status()
 
 
-def _get_csrf_token(session: requests.Session, *, timeout_s: float) -> tuple[str, str]:
+async def _get_csrf_token(
+    client: httpx.AsyncClient, *, timeout_s: float
+) -> tuple[str, str]:
     params = {"t": int(datetime.now().timestamp() * 1000)}
-    r = session.get(f"{BASE_URL}/GetCSRFToken", params=params, timeout=timeout_s)
+    r = await client.get(f"{BASE_URL}/GetCSRFToken", params=params, timeout=timeout_s)
     r.raise_for_status()
 
     match = re.search(r"name='([^']+)' value='([^']+)'", r.text)
@@ -46,18 +53,83 @@ def _get_csrf_token(session: requests.Session, *, timeout_s: float) -> tuple[str
     return match.group(1), match.group(2)
 
 
-def fetch_train_status_html(
+class _UpstreamClient:
+    """Process-wide httpx client plus the CSRF token bound to its cookies."""
+
+    def __init__(self, ttl_s: float) -> None:
+        self._ttl_s = ttl_s
+        self._lock = asyncio.Lock()
+        self._client: httpx.AsyncClient | None = None
+        self._token: tuple[str, str] | None = None
+        self._expires_at = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError(
+                "Upstream client is not open; call open_upstream_client() first"
+            )
+        return self._client
+
+    def open(self, *, timeout_s: float) -> None:
+        if self._client is not None:
+            return
+        # Needs the httpx[http2,brotli,zstd] extras: h2 for HTTP/2, and the
+        # decoders behind the "br, zstd" advertised in DEFAULT_HEADERS.
+        self._client = httpx.AsyncClient(
+            http2=True,
+            headers=DEFAULT_HEADERS,
+            timeout=timeout_s,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+
+    async def aclose(self) -> None:
+        if self._client is None:
+            return
+        client, self._client = self._client, None
+        self._token = None
+        await client.aclose()
+
+    async def csrf_token(
+        self,
+        *,
+        timeout_s: float,
+        stale: tuple[str, str] | None = None,
+    ) -> tuple[str, str]:
+        """Return the cached token, refreshing it if expired or equal to `stale`."""
+        async with self._lock:
+            if (
+                self._token is None
+                or self._token == stale
+                or time.monotonic() >= self._expires_at
+            ):
+                await _bootstrap_session(self.client, timeout_s=timeout_s)
+                self._token = await _get_csrf_token(self.client, timeout_s=timeout_s)
+                self._expires_at = time.monotonic() + self._ttl_s
+            return self._token
+
+
+_UPSTREAM = _UpstreamClient(CSRF_TOKEN_TTL_S)
+
+
+def open_upstream_client(*, timeout_s: float = 10.0) -> None:
+    """Create the shared upstream HTTP client (call once at application startup)."""
+    _UPSTREAM.open(timeout_s=timeout_s)
+
+
+async def close_upstream_client() -> None:
+    """Close the shared upstream HTTP client (call once at application shutdown)."""
+    await _UPSTREAM.aclose()
+
+
+async def _post_running_status(
     train_number: int | str,
+    csrf: tuple[str, str],
     *,
-    timeout_s: float = 10.0,
-) -> str:
-    """Fetch running status HTML from the upstream website."""
-    session = requests.Session()
-    session.headers.update(DEFAULT_HEADERS)
-
-    _bootstrap_session(session, timeout_s=timeout_s)
-    csrf_key, csrf_val = _get_csrf_token(session, timeout_s=timeout_s)
-
+    timeout_s: float,
+) -> httpx.Response:
+    csrf_key, csrf_val = csrf
     params = {
         "opt": "TrainRunning",
         "subOpt": "FindRunningInstance",
@@ -69,7 +141,26 @@ def fetch_train_status_html(
         "trainNo": str(train_number),
         csrf_key: csrf_val,
     }
+    return await _UPSTREAM.client.post(
+        f"{BASE_URL}/tr", params=params, data=data, timeout=timeout_s
+    )
+
+
+async def fetch_train_status_html(
+    train_number: int | str,
+    *,
+    timeout_s: float = 10.0,
+) -> str:
+    """Fetch running status HTML from the upstream website.
+
+    Uses the shared keep-alive client and a cached CSRF token; if upstream rejects
+    the token with 403, a fresh one is fetched and the request retried once.
+    """
+    csrf = await _UPSTREAM.csrf_token(timeout_s=timeout_s)
+    r = await _post_running_status(train_number, csrf, timeout_s=timeout_s)
+    if r.status_code == 403:
+        csrf = await _UPSTREAM.csrf_token(timeout_s=timeout_s, stale=csrf)
+        r = await _post_running_status(train_number, csrf, timeout_s=timeout_s)
 
-    r = session.post(f"{BASE_URL}/tr", params=params, data=data, timeout=timeout_s)
     r.raise_for_status()
     return r.text
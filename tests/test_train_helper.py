@@ -0,0 +1,29 @@
+import unittest
+from datetime import datetime
+
+from app.helpers.train_helper import parse_train_status_html
+
+
+class ParseTrainStatusHtmlTest(unittest.TestCase):
+    def test_xhtml_with_encoding_declaration(self):
+        html_text = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml"><body>\n'
+            "<div>Last Updates On 14-Oct-2026 12:35</div>\n"
+            "<div>Arrived at KANPUR CENTRAL (CNB) 10:45 14-Oct-2026</div>\n"
+            "</body></html>"
+        )
+
+        parsed = parse_train_status_html(html_text)
+
+        self.assertEqual(parsed["last_update"], datetime(2026, 10, 14, 12, 35))
+        self.assertEqual(len(parsed["events"]), 1)
+        event = parsed["events"][0]
+        self.assertEqual(event["type"], "Arrived")
+        self.assertEqual(event["station"], "KANPUR CENTRAL")
+        self.assertEqual(event["code"], "CNB")
+        self.assertEqual(event["datetime"], datetime(2026, 10, 14, 10, 45))
+
+
+if __name__ == "__main__":
+    unittest.main()